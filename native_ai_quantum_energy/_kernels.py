@@ -0,0 +1,47 @@
+"""Optional Numba-compiled kernels for the quantum circuit simulator.
+
+The NumPy kernels in :mod:`native_ai_quantum_energy.quantum_simulator` make
+one pass over the state vector per gate but run on a single thread.  When
+Numba is installed, the functions in :mod:`._numba_kernels` provide
+multithreaded replacements for the hottest kernels; ``QuantumCircuit``
+dispatches to them for registers of at least ``NUMBA_MIN_QUBITS`` qubits,
+where the state vector is large enough for the parallel speed-up to
+outweigh the threading overhead.  When Numba is not available
+``NUMBA_AVAILABLE`` is ``False`` and the simulator keeps using its NumPy
+kernels.
+
+Importing Numba takes a noticeable fraction of a second, so this module
+only checks whether it is installed; :func:`load` imports the kernels on
+first use.
+
+All kernels operate in place on a contiguous ``complex128`` or ``complex64``
+state vector (Numba compiles one specialisation per dtype) and use the
+simulator's bit ordering, in which qubit 0 is the most significant bit of
+the basis-state index.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from types import ModuleType
+
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+# Smallest register size for which the Numba kernels are used.
+NUMBA_MIN_QUBITS = 14
+
+
+def load() -> ModuleType | None:
+    """Return the module of compiled kernels, or ``None`` if Numba is unavailable.
+
+    The first call imports Numba and the kernels (compiling them unless
+    Numba's on-disk cache is warm); later calls return the same module.
+    """
+
+    if not NUMBA_AVAILABLE:
+        return None
+    try:
+        from . import _numba_kernels
+    except ImportError:  # pragma: no cover - broken Numba installation
+        return None
+    return _numba_kernels
@@ -0,0 +1,112 @@
+"""Numba implementations of the kernels described in :mod:`._kernels`.
+
+This module imports Numba at load time, so it is only imported through
+:func:`native_ai_quantum_energy._kernels.load`, by the first circuit large
+enough to use the compiled kernels.
+"""
+
+from __future__ import annotations
+
+from numba import njit, prange
+
+
+@njit(cache=True)
+def _insert_zero_bit(value, position):
+    """Insert a zero bit into ``value`` at bit ``position`` (LSB = 0)."""
+
+    low = value & ((1 << position) - 1)
+    return ((value >> position) << (position + 1)) | low
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def apply_1q(state, g00, g01, g10, g11, target_bit):
+    """Apply a 2x2 gate to the qubit stored at index bit ``target_bit``.
+
+    The loop runs over the ``2**(n-1)`` amplitude pairs rather than over
+    blocks of the state vector, so the work is split evenly between
+    threads whichever qubit is targeted (with qubit 0 there is only a
+    single block).
+    """
+
+    target_mask = 1 << target_bit
+    for k in prange(state.shape[0] >> 1):
+        i0 = _insert_zero_bit(k, target_bit)
+        i1 = i0 | target_mask
+        a = state[i0]
+        b = state[i1]
+        state[i0] = g00 * a + g01 * b
+        state[i1] = g10 * a + g11 * b
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def apply_cnot(state, control_bit, target_bit):
+    """Flip bit ``target_bit`` of every basis state with bit ``control_bit`` set.
+
+    Bit positions count from the least significant bit of the index.
+    """
+
+    low_bit = min(control_bit, target_bit)
+    high_bit = max(control_bit, target_bit)
+    control_mask = 1 << control_bit
+    target_mask = 1 << target_bit
+    for k in prange(state.shape[0] >> 2):
+        i = _insert_zero_bit(_insert_zero_bit(k, low_bit), high_bit) | control_mask
+        j = i | target_mask
+        a = state[i]
+        state[i] = state[j]
+        state[j] = a
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def apply_cz(state, control_bit, target_bit):
+    """Negate every amplitude whose bits ``control_bit`` and ``target_bit`` are set."""
+
+    low_bit = min(control_bit, target_bit)
+    high_bit = max(control_bit, target_bit)
+    both_mask = (1 << control_bit) | (1 << target_bit)
+    for k in prange(state.shape[0] >> 2):
+        i = _insert_zero_bit(_insert_zero_bit(k, low_bit), high_bit) | both_mask
+        state[i] = -state[i]
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def apply_bell_prep(state, control_bit, target_bit, scale):
+    """Apply H to bit ``control_bit`` and then CNOT onto ``target_bit``, in one pass.
+
+    ``scale`` is ``1/sqrt(2)``; each group of four amplitudes that the
+    two bits couple is read and written once.
+    """
+
+    low_bit = min(control_bit, target_bit)
+    high_bit = max(control_bit, target_bit)
+    control_mask = 1 << control_bit
+    target_mask = 1 << target_bit
+    for k in prange(state.shape[0] >> 2):
+        i00 = _insert_zero_bit(_insert_zero_bit(k, low_bit), high_bit)
+        i01 = i00 | target_mask
+        i10 = i00 | control_mask
+        i11 = i10 | target_mask
+        a00 = state[i00]
+        a01 = state[i01]
+        a10 = state[i10]
+        a11 = state[i11]
+        state[i00] = (a00 + a10) * scale
+        state[i01] = (a01 + a11) * scale
+        state[i10] = (a01 - a11) * scale
+        state[i11] = (a00 - a10) * scale
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def collapse(state, out, measured_mask, pattern, scale):
+    """Write into ``out`` the amplitudes matching ``pattern`` on ``measured_mask``, scaled.
+
+    Amplitudes of basis states whose measured bits differ from
+    ``pattern`` are set to zero.  ``out`` may be ``state`` itself, in
+    which case the collapse happens in place.
+    """
+
+    for i in prange(state.shape[0]):
+        if (i & measured_mask) == pattern:
+            out[i] = state[i] * scale
+        else:
+            out[i] = 0
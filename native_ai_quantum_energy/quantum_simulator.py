@@ -6,8 +6,6 @@ applying a range of single-qubit gates (Hadamard, the Pauli set, phase gates
 and arbitrary rotations) and multi-qubit controlled operations such as CNOT and
 controlled-Z.  The simulator can also be initialised from an arbitrary state
 vector, and supports measuring either all qubits or only a subset of them.
-The simulator is intentionally small and focused on clarity rather than
-performance.
 
 Example
 -------
@@ -27,135 +25,605 @@ result = qc.measure_all()
 print("Measurement outcomes:", result)
 ```
 
-The implementation is written using only the Python standard library so it can
-run without third-party numerical dependencies.
+The state vector is stored as a contiguous NumPy ``complex128`` array so that
+gate kernels can operate on packed amplitudes rather than boxed Python
+``complex`` objects.  Passing ``dtype=np.complex64`` halves the memory per
+amplitude, which is usually precise enough for sampling workloads.
+
+Performance is a design goal: gates are queued and fused before they touch
+the state vector, common gates (H, X, Y, the diagonal gates, CNOT, CZ) have
+dedicated in-place kernels, and larger registers use the optional Numba
+kernels in :mod:`native_ai_quantum_energy._kernels` or, with
+``device="cuda"``, CuPy arrays on the GPU.
 """
 
 from __future__ import annotations
 
 import math
 import random
-from typing import List, Sequence, Tuple
+from functools import lru_cache
+from typing import List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from . import _kernels
+
+__all__ = ["QuantumCircuit"]
 
 GateMatrix = Tuple[Tuple[complex, complex], Tuple[complex, complex]]
+PendingGate = Tuple[Tuple[int, ...], np.ndarray]
+
+
+def _constant_gate(rows: Sequence[Sequence[complex]]) -> np.ndarray:
+    """Return ``rows`` as a read-only ``complex128`` matrix shared by all circuits."""
+
+    matrix = np.array(rows, dtype=np.complex128)
+    matrix.setflags(write=False)
+    return matrix
+
+
+_INV_SQRT2 = 1.0 / math.sqrt(2.0)
+
+H_GATE = _constant_gate([[_INV_SQRT2, _INV_SQRT2], [_INV_SQRT2, -_INV_SQRT2]])
+X_GATE = _constant_gate([[0, 1], [1, 0]])
+Y_GATE = _constant_gate([[0, -1j], [1j, 0]])
+Z_GATE = _constant_gate([[1, 0], [0, -1]])
+S_GATE = _constant_gate([[1, 0], [0, 1j]])
+T_GATE = _constant_gate([[1, 0], [0, math.cos(math.pi / 4) + 1j * math.sin(math.pi / 4)]])
+CNOT_MATRIX = _constant_gate([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]])
+CZ_MATRIX = _constant_gate(np.diag([1, 1, 1, -1]))
+# Hadamard on the first qubit followed by a CNOT controlled by it.
+BELL_PREP_MATRIX = _constant_gate(CNOT_MATRIX @ np.kron(H_GATE, np.eye(2)))
+# Two-qubit gates with a dedicated kernel, as nested lists for cheap comparison.
+_STRUCTURED_TWO_QUBIT_ROWS = [gate.tolist() for gate in (CNOT_MATRIX, CZ_MATRIX, BELL_PREP_MATRIX)]
+# Gates that are their own inverse, so two adjacent copies on the same qubits cancel.
+_SELF_INVERSE_GATES = (H_GATE, X_GATE, Y_GATE, Z_GATE, CNOT_MATRIX, CZ_MATRIX)
+
+
+# Rotation matrices are cached per angle, since variational workloads tend to
+# reuse the same angles many times.  The half-angle cosine and sine are cached
+# separately so that RX, RY and RZ by the same angle share one evaluation.
+@lru_cache(maxsize=4096)
+def _half_angle_trig(angle: float) -> Tuple[float, float]:
+    half = angle / 2.0
+    return math.cos(half), math.sin(half)
+
+
+@lru_cache(maxsize=4096)
+def _rx_matrix(angle: float) -> np.ndarray:
+    cos, sin = _half_angle_trig(angle)
+    return _constant_gate([[cos, -1j * sin], [-1j * sin, cos]])
+
+
+@lru_cache(maxsize=4096)
+def _ry_matrix(angle: float) -> np.ndarray:
+    cos, sin = _half_angle_trig(angle)
+    return _constant_gate([[cos, -sin], [sin, cos]])
+
+
+@lru_cache(maxsize=4096)
+def _rz_matrix(angle: float) -> np.ndarray:
+    cos, sin = _half_angle_trig(angle)
+    return _constant_gate([[cos - 1j * sin, 0], [0, cos + 1j * sin]])
+
+
+def _array_module(device: str):
+    """Return the array module (NumPy or CuPy) backing state vectors on ``device``."""
+
+    if device == "cpu":
+        return np
+    if device == "cuda":
+        try:
+            import cupy
+        except ImportError as exc:
+            raise ImportError("device='cuda' requires CuPy to be installed") from exc
+        return cupy
+    raise ValueError(f"Unknown device {device!r}; expected 'cpu' or 'cuda'")
+
+
+@lru_cache(maxsize=None)
+def _qubit_layout(num_qubits: int) -> Tuple[Tuple[Tuple[int, int, int], ...], Tuple[int, ...]]:
+    """Return per-qubit reshape shapes and bit masks for a ``num_qubits`` register.
+
+    The shape ``(2**q, 2, 2**(n - q - 1))`` isolates qubit ``q`` as the
+    middle axis of the state vector, and the mask is the bit of ``q`` within
+    a basis-state index.  The tables are shared by all circuits of that size.
+    """
+
+    shapes = tuple((1 << q, 2, 1 << (num_qubits - 1 - q)) for q in range(num_qubits))
+    masks = tuple(1 << (num_qubits - 1 - q) for q in range(num_qubits))
+    return shapes, masks
+
+
+@lru_cache(maxsize=None)
+def _identity(dim: int) -> np.ndarray:
+    """Return a read-only ``dim x dim`` identity matrix."""
+
+    return _constant_gate(np.eye(dim))
+
+
+def _embed_matrix(
+    matrix: np.ndarray, qubits: Sequence[int], layout: Sequence[int]
+) -> np.ndarray:
+    """Expand ``matrix`` acting on ``qubits`` to the larger register ``layout``.
+
+    Both ``qubits`` and ``layout`` list qubits from most to least significant
+    bit of the respective matrix index.  Qubits of ``layout`` not present in
+    ``qubits`` are acted on by the identity.
+    """
+
+    if tuple(qubits) == tuple(layout):
+        return matrix
+    k = len(layout)
+    m = len(qubits)
+    axes = [layout.index(q) for q in qubits]
+    tensor = matrix.reshape((2,) * (2 * m))
+    identity = _identity(1 << k).reshape((2,) * k + (1 << k,))
+    result = np.tensordot(tensor, identity, axes=(list(range(m, 2 * m)), axes))
+    result = np.moveaxis(result, list(range(m)), axes)
+    return result.reshape(1 << k, 1 << k)
+
+
+def _has_structured_kernel(matrix: np.ndarray) -> bool:
+    """Return whether a block with ``matrix`` is applied by a specialised kernel.
+
+    These are diagonal gates, the anti-diagonal (X, Y) and butterfly (H)
+    single-qubit gates, and CNOT, CZ and the Bell-preparation gate.  The
+    entries are compared as Python numbers, which is cheaper than NumPy
+    calls on matrices this small.
+    """
+
+    rows = matrix.tolist()
+    if all(value == 0 for i, row in enumerate(rows) for j, value in enumerate(row) if i != j):
+        return True
+    if len(rows) == 2:
+        (g00, g01), (g10, g11) = rows
+        return (g00 == 0 and g11 == 0) or g00 == g01 == g10 == -g11
+    return rows in _STRUCTURED_TWO_QUBIT_ROWS
+
+
+# Registers of at most this many qubits apply single-qubit gates through a
+# generated straight-line kernel: with eight or fewer amplitudes the fixed
+# cost of dispatching NumPy operations exceeds the arithmetic itself.
+_UNROLLED_MAX_QUBITS = 3
+
+
+@lru_cache(maxsize=None)
+def _unrolled_single_qubit_kernel(num_qubits: int, qubit: int):
+    """Return a kernel applying a 2x2 gate to ``qubit`` of an ``num_qubits`` register.
+
+    The kernel is generated source with one statement per amplitude pair and
+    no loops, compiled once per ``(num_qubits, qubit)``.  It is called as
+    ``kernel(state, g00, g01, g10, g11)`` with the gate entries as Python
+    ``complex`` numbers and updates ``state`` in place.
+    """
+
+    mask = 1 << (num_qubits - 1 - qubit)
+    lines = ["def kernel(state, g00, g01, g10, g11):", "    s = state.tolist()"]
+    for i in range(1 << num_qubits):
+        if i & mask:
+            continue
+        j = i | mask
+        lines.append(f"    a = s[{i}]; b = s[{j}]")
+        lines.append(f"    s[{i}] = g00 * a + g01 * b; s[{j}] = g10 * a + g11 * b")
+    lines.append("    state[:] = s")
+    namespace: dict = {}
+    exec("\n".join(lines), namespace)
+    return namespace["kernel"]
 
 
 class QuantumCircuit:
-    """A minimal quantum circuit simulator based on state vectors."""
+    """A minimal quantum circuit simulator based on state vectors.
+
+    Gates are not applied to the state vector immediately.  Each ``apply_*``
+    call validates its arguments and appends the gate to a pending queue.  A
+    gate is instead multiplied into the latest queued entry sharing one of
+    its qubits (gates on disjoint qubits commute) when the two together span
+    at most ``max_fused_qubits`` qubits, so e.g. single-qubit gates on one
+    qubit accumulate into one matrix even when interleaved with gates on
+    other qubits.  The queue is flushed whenever the state is observed
+    (``state``, ``statevector``, ``probabilities``, ``amplitudes`` and the
+    ``measure*`` methods), so a chain such as ``H; RZ; H`` on one qubit
+    costs a single pass over the state vector.
+
+    Fusion never turns gates into a dense multi-qubit matrix, which would
+    cost more to apply than the gates' specialised kernels.  Multi-qubit
+    blocks are only formed when the result keeps such a kernel, so
+    ``max_fused_qubits`` bounds the size of fused diagonal blocks (CZ and
+    the phase gates) and allows ``H; CNOT`` to become one Bell-preparation
+    block; it has no effect on single-qubit accumulation.
+
+    With ``device="cuda"`` the state vector is held in GPU memory as a CuPy
+    array and every kernel runs on the device; results are copied back to
+    the host only by ``statevector``, ``amplitudes`` and ``probabilities``.
+
+    ``dtype`` selects the precision of the state vector (``complex128`` or
+    ``complex64``).  Fused gate matrices are computed in double precision and
+    cast to ``dtype`` only when applied.
+
+    Measurements draw their random numbers from ``rng`` (a
+    ``numpy.random.Generator``) when one is given, and from the standard
+    library ``random`` module otherwise, so ``random.seed`` keeps working
+    for circuits created without one.
+    """
 
     # Gate matrices for convenience
-    H_GATE: GateMatrix = (
-        (1 / math.sqrt(2) + 0j, 1 / math.sqrt(2) + 0j),
-        (1 / math.sqrt(2) + 0j, -(1 / math.sqrt(2)) + 0j),
-    )
-    X_GATE: GateMatrix = ((0 + 0j, 1 + 0j), (1 + 0j, 0 + 0j))
-    Y_GATE: GateMatrix = ((0 + 0j, -1j), (1j, 0 + 0j))
-    Z_GATE: GateMatrix = ((1 + 0j, 0 + 0j), (0 + 0j, -1 + 0j))
-    S_GATE: GateMatrix = ((1 + 0j, 0 + 0j), (0 + 0j, 1j))
-    T_GATE: GateMatrix = (
-        (1 + 0j, 0 + 0j),
-        (0 + 0j, math.cos(math.pi / 4) + 1j * math.sin(math.pi / 4)),
-    )
-
-    def __init__(self, num_qubits: int) -> None:
+    H_GATE: np.ndarray = H_GATE
+    X_GATE: np.ndarray = X_GATE
+    Y_GATE: np.ndarray = Y_GATE
+    Z_GATE: np.ndarray = Z_GATE
+    S_GATE: np.ndarray = S_GATE
+    T_GATE: np.ndarray = T_GATE
+
+    def __init__(
+        self,
+        num_qubits: int,
+        max_fused_qubits: int = 3,
+        device: str = "cpu",
+        dtype: np.dtype | type = np.complex128,
+        rng: np.random.Generator | None = None,
+    ) -> None:
         if num_qubits < 1:
             raise ValueError("A circuit must have at least one qubit.")
+        if max_fused_qubits < 1:
+            raise ValueError("max_fused_qubits must be at least 1.")
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.complex64, np.complex128):
+            raise ValueError("dtype must be complex64 or complex128")
         self.num_qubits = num_qubits
+        self.max_fused_qubits = max_fused_qubits
+        self.device = device
+        # Source of measurement randomness; the ``random`` module when None.
+        self.rng = rng
+        self._xp = _array_module(device)
+        self._shape_for_q, self._mask_for_q = _qubit_layout(num_qubits)
+        # The kernel backend is chosen once per circuit rather than per gate:
+        # the Numba kernels are used for large host-side registers if available.
+        # Numba itself is only imported by the first circuit that uses them.
+        self._numba = (
+            _kernels.load()
+            if self._xp is np and num_qubits >= _kernels.NUMBA_MIN_QUBITS
+            else None
+        )
+        self._use_numba = self._numba is not None
+        self._use_unrolled = self._xp is np and num_qubits <= _UNROLLED_MAX_QUBITS
         # Start in the |0...0⟩ state
-        dim = 2 ** num_qubits
-        self.state: List[complex] = [0j] * dim
-        self.state[0] = 1.0 + 0j
+        self._state: np.ndarray = self._xp.zeros(1 << num_qubits, dtype=self.dtype)
+        self._state[0] = 1.0
+        # Gates queued for application, each as (qubits, unitary matrix)
+        self._pending: List[PendingGate] = []
         # Store the outcomes of the most recent measurement call
         self.measurements: List[int] = []
 
-    def _apply_single_qubit_gate(self, gate: GateMatrix, qubit: int) -> None:
-        """Apply a single-qubit gate to the specified qubit.
+    @property
+    def state(self) -> np.ndarray:
+        """The state vector, with any pending gates applied."""
 
-        This constructs the full operator implicitly by iterating over the
-        amplitudes associated with the target qubit and updating the state
-        vector in place.
-        """
+        self._flush()
+        return self._state
+
+    @state.setter
+    def state(self, value: np.ndarray) -> None:
+        # Pending gates would only have acted on the state being replaced.
+        self._pending.clear()
+        # The kernels update reshaped views of the buffer in place, which only
+        # alias the state when it is a single contiguous block of amplitudes.
+        self._state = self._xp.ascontiguousarray(value, dtype=self.dtype)
 
-        if qubit < 0 or qubit >= self.num_qubits:
+    def _check_qubits(self, *qubits: int) -> None:
+        if any(q < 0 or q >= self.num_qubits for q in qubits):
             raise IndexError("Qubit index out of range")
 
-        mask = 1 << (self.num_qubits - 1 - qubit)
-        new_state = self.state.copy()
-        for index in range(len(self.state)):
-            if index & mask:
-                continue  # processed as the partner of an earlier index
-            partner = index | mask
-            amp0 = self.state[index]
-            amp1 = self.state[partner]
-            new_state[index] = gate[0][0] * amp0 + gate[0][1] * amp1
-            new_state[partner] = gate[1][0] * amp0 + gate[1][1] * amp1
-        self.state = new_state
+    def _squared_magnitudes(self, state: np.ndarray) -> np.ndarray:
+        """Return ``|amplitude|**2`` for every entry of the contiguous ``state``.
+
+        The complex buffer is viewed as ``(re, im)`` rows of real numbers and
+        reduced with a single einsum, avoiding the temporaries of
+        ``state.real ** 2 + state.imag ** 2``.
+        """
+
+        pairs = state.view(state.real.dtype).reshape(-1, 2)
+        return self._xp.einsum("ij,ij->i", pairs, pairs)
+
+    def _to_host(self, array: np.ndarray) -> np.ndarray:
+        """Return a host (NumPy) copy of ``array``."""
+
+        if self._xp is np:
+            return array.copy()
+        return self._xp.asnumpy(array)
+
+    def _enqueue(self, qubits: Tuple[int, ...], matrix: np.ndarray) -> None:
+        """Queue ``matrix`` acting on ``qubits``, fusing it into an earlier entry if possible.
+
+        The gate commutes with every queued entry on disjoint qubits, so it
+        is fused into the most recent entry sharing a qubit with it, as long
+        as the combined block spans at most ``max_fused_qubits`` qubits.  A
+        gate sharing no qubit with any queued entry is appended unfused, and
+        so is one whose fusion would not leave a multi-qubit block with a
+        specialised kernel (CNOT, CZ, Bell preparation or diagonal).
+        """
+
+        target = len(self._pending) - 1
+        while target >= 0 and not set(self._pending[target][0]).intersection(qubits):
+            target -= 1
+        if target >= 0:
+            entry_qubits, entry_matrix = self._pending[target]
+            # Keep the gate's qubit order when it spans the block, so that e.g.
+            # ``H(2); CNOT(2, 0)`` lines up with ``BELL_PREP_MATRIX``.
+            if set(entry_qubits) <= set(qubits):
+                layout = qubits
+            else:
+                layout = tuple(sorted(set(entry_qubits) | set(qubits)))
+            single = len(layout) == 1
+            if len(layout) <= self.max_fused_qubits and (
+                single
+                or (_has_structured_kernel(entry_matrix) and _has_structured_kernel(matrix))
+            ):
+                if layout == qubits == entry_qubits:
+                    fused = matrix @ entry_matrix
+                else:
+                    fused = _embed_matrix(matrix, qubits, layout) @ _embed_matrix(
+                        entry_matrix, entry_qubits, layout
+                    )
+                if np.abs(fused - _identity(fused.shape[0])).max() <= 1e-12:
+                    # The gate undoes the entry (e.g. ``H; H``), so both are dropped.
+                    del self._pending[target]
+                    return
+                if single or _has_structured_kernel(fused):
+                    self._pending[target] = (layout, fused)
+                    return
+        self._pending.append((qubits, matrix))
+
+    def _flush(self) -> None:
+        """Apply all pending gates to the state vector."""
+
+        pending = self._cancel_inverse_pairs(self._pending)
+        self._pending = []
+        # The structure checks run on the double-precision matrices, which
+        # are exact for the gate constants; only what is handed to a kernel
+        # is cast to the state's dtype.
+        for qubits, matrix in pending:
+            if len(qubits) == 1:
+                # Unpack the four entries once into Python scalars, so the
+                # structure checks and kernels below never index the matrix.
+                g00, g01, g10, g11 = matrix.ravel().tolist()
+                qubit = qubits[0]
+                if self._use_unrolled:
+                    _unrolled_single_qubit_kernel(self.num_qubits, qubit)(
+                        self._state, g00, g01, g10, g11
+                    )
+                elif g01 == 0 and g10 == 0:
+                    self._apply_diagonal_single(g00, g11, qubit)
+                elif g00 == 0 and g11 == 0:
+                    self._apply_antidiagonal_single(g01, g10, qubit)
+                elif g00 == g01 == g10 == -g11 and not self._use_numba:
+                    self._apply_butterfly_single(g00, qubit)
+                else:
+                    self._apply_single_qubit_gate(g00, g01, g10, g11, qubit)
+            elif len(qubits) == 2 and np.array_equal(matrix, CNOT_MATRIX):
+                self._apply_cnot_kernel(*qubits)
+            elif len(qubits) == 2 and np.array_equal(matrix, CZ_MATRIX):
+                self._apply_cz_kernel(*qubits)
+            elif len(qubits) == 2 and np.array_equal(matrix, BELL_PREP_MATRIX):
+                self._apply_bell_prep_kernel(*qubits)
+            else:
+                # ``_enqueue`` only forms multi-qubit blocks that keep a
+                # specialised kernel, so any other block is diagonal.
+                self._apply_diagonal(np.diagonal(matrix).astype(self.dtype), qubits)
+
+    @staticmethod
+    def _cancel_inverse_pairs(pending: List[PendingGate]) -> List[PendingGate]:
+        """Drop adjacent pairs of the same self-inverse gate from ``pending``.
+
+        Fusion already removes pairs such as ``H; H`` that it can merge;
+        this scan also removes pairs that could not be fused (for example two
+        CNOTs on the same wires with ``max_fused_qubits=1``).  Gates are
+        compared by identity with the shared constants, so the scan does no
+        arithmetic.
+        """
+
+        kept: List[PendingGate] = []
+        for qubits, matrix in pending:
+            if (
+                kept
+                and kept[-1][0] == qubits
+                and kept[-1][1] is matrix
+                and any(matrix is gate for gate in _SELF_INVERSE_GATES)
+            ):
+                kept.pop()
+                continue
+            kept.append((qubits, matrix))
+        return kept
+
+    def _split_lightcone(self, qubits: Sequence[int]) -> List[PendingGate]:
+        """Keep only the pending gates that can affect ``qubits``; return the rest.
+
+        Walking the queue backwards from a measurement of ``qubits``, a gate
+        is in the lightcone if it shares a qubit with the measured qubits or
+        with a later lightcone gate.  The remaining gates act only on other
+        qubits than every later lightcone gate and the measurement, so they
+        commute past the measurement and can be applied after it.
+        """
+
+        live = set(qubits)
+        lightcone: List[PendingGate] = []
+        deferred: List[PendingGate] = []
+        for entry in reversed(self._pending):
+            if live.intersection(entry[0]):
+                live.update(entry[0])
+                lightcone.append(entry)
+            else:
+                deferred.append(entry)
+        self._pending = lightcone[::-1]
+        return deferred[::-1]
+
+    def _apply_single_qubit_gate(
+        self, g00: complex, g01: complex, g10: complex, g11: complex, qubit: int
+    ) -> None:
+        """Apply the gate ``[[g00, g01], [g10, g11]]`` to the specified qubit.
+
+        The state vector is viewed as a ``(2**qubit, 2, 2**(n - qubit - 1))``
+        tensor so that the target qubit becomes the middle axis, whose two
+        halves are then updated in place.  Only one half-sized copy of the
+        amplitudes is kept while the first half is overwritten.
+        """
+
+        if self._use_numba:
+            self._numba.apply_1q(self._state, g00, g01, g10, g11, self.num_qubits - 1 - qubit)
+            return
+        view = self._state.reshape(self._shape_for_q[qubit])
+        upper = view[:, 0, :]
+        lower = view[:, 1, :]
+        scratch = upper.copy()
+        upper *= g00
+        upper += g01 * lower
+        lower *= g11
+        scratch *= g10
+        lower += scratch
+
+    def _apply_diagonal_single(self, phase0: complex, phase1: complex, qubit: int) -> None:
+        """Apply the diagonal gate ``diag(phase0, phase1)`` to one qubit.
+
+        Only the half of the state vector whose amplitudes are scaled by a
+        non-trivial phase is touched, so gates such as Z, S and T read and
+        write half as much memory as the general kernel.
+        """
+
+        view = self._state.reshape(self._shape_for_q[qubit])
+        if phase0 != 1:
+            view[:, 0, :] *= phase0
+        view[:, 1, :] *= phase1
+
+    def _apply_diagonal(self, phases: np.ndarray, qubits: Sequence[int]) -> None:
+        """Apply a diagonal gate with entries ``phases`` acting on ``qubits``.
+
+        Each entry scales the slab of amplitudes whose ``qubits`` bits spell
+        its index; slabs whose phase is exactly 1 are skipped, so a
+        controlled-Z only touches a quarter of the state vector.
+        """
+
+        k = len(qubits)
+        view = self._state.reshape((2,) * self.num_qubits)
+        for index, phase in enumerate(phases):
+            if phase == 1:
+                continue
+            selector: List[object] = [slice(None)] * self.num_qubits
+            for position, q in enumerate(qubits):
+                selector[q] = (index >> (k - 1 - position)) & 1
+            view[tuple(selector)] *= phase
+
+    def _apply_antidiagonal_single(self, upper: complex, lower: complex, qubit: int) -> None:
+        """Apply the gate ``[[0, upper], [lower, 0]]`` (X, Y, ...) to one qubit.
+
+        The two halves of the state vector are swapped through a half-sized
+        scratch buffer, and only scaled where the phase is not 1, so Pauli-X
+        costs no arithmetic at all.
+        """
+
+        view = self._state.reshape(self._shape_for_q[qubit])
+        scratch = view[:, 0, :].copy()
+        view[:, 0, :] = view[:, 1, :]
+        view[:, 1, :] = scratch
+        if upper != 1:
+            view[:, 0, :] *= upper
+        if lower != 1:
+            view[:, 1, :] *= lower
+
+    def _apply_butterfly_single(self, scale: complex, qubit: int) -> None:
+        """Apply ``scale * [[1, 1], [1, -1]]`` (the Hadamard gate for ``1/sqrt(2)``).
+
+        The halves are combined with one addition and one subtraction and
+        then scaled, instead of the four complex multiplications of the
+        general kernel.
+        """
+
+        if scale.imag == 0:
+            scale = scale.real
+        view = self._state.reshape(self._shape_for_q[qubit])
+        upper = view[:, 0, :]
+        lower = view[:, 1, :]
+        scratch = upper.copy()
+        upper += lower
+        upper *= scale
+        self._xp.subtract(scratch, lower, out=lower)
+        lower *= scale
 
     def apply_hadamard(self, qubit: int) -> None:
         """Apply a Hadamard gate (H) to one qubit."""
 
-        self._apply_single_qubit_gate(self.H_GATE, qubit)
+        self._apply_gate(self.H_GATE, qubit)
 
     def apply_pauli_x(self, qubit: int) -> None:
         """Apply a Pauli-X (NOT) gate to one qubit."""
 
-        self._apply_single_qubit_gate(self.X_GATE, qubit)
+        self._apply_gate(self.X_GATE, qubit)
 
     def apply_pauli_y(self, qubit: int) -> None:
         """Apply a Pauli-Y gate to one qubit."""
 
-        self._apply_single_qubit_gate(self.Y_GATE, qubit)
+        self._apply_gate(self.Y_GATE, qubit)
 
     def apply_pauli_z(self, qubit: int) -> None:
         """Apply a Pauli-Z gate to one qubit."""
 
-        self._apply_single_qubit_gate(self.Z_GATE, qubit)
+        self._apply_gate(self.Z_GATE, qubit)
 
     def apply_s(self, qubit: int) -> None:
         """Apply the phase (S) gate to one qubit."""
 
-        self._apply_single_qubit_gate(self.S_GATE, qubit)
+        self._apply_gate(self.S_GATE, qubit)
 
     def apply_t(self, qubit: int) -> None:
         """Apply the T (π/8) gate to one qubit."""
 
-        self._apply_single_qubit_gate(self.T_GATE, qubit)
+        self._apply_gate(self.T_GATE, qubit)
+
+    def _apply_gate(self, gate: GateMatrix | np.ndarray, qubit: int) -> None:
+        """Validate ``qubit`` and queue the single-qubit ``gate`` on it."""
+
+        self._check_qubits(qubit)
+        self._enqueue((qubit,), np.asarray(gate, dtype=np.complex128))
 
     def apply_rx(self, qubit: int, angle: float) -> None:
         """Apply a rotation around the X axis by ``angle`` radians."""
 
-        half = angle / 2.0
-        cos = math.cos(half)
-        sin = math.sin(half)
-        gate: GateMatrix = (
-            (cos + 0j, -1j * sin),
-            (-1j * sin, cos + 0j),
-        )
-        self._apply_single_qubit_gate(gate, qubit)
+        self._apply_gate(_rx_matrix(angle), qubit)
 
     def apply_ry(self, qubit: int, angle: float) -> None:
         """Apply a rotation around the Y axis by ``angle`` radians."""
 
-        half = angle / 2.0
-        cos = math.cos(half)
-        sin = math.sin(half)
-        gate: GateMatrix = (
-            (cos + 0j, -sin + 0j),
-            (sin + 0j, cos + 0j),
-        )
-        self._apply_single_qubit_gate(gate, qubit)
+        self._apply_gate(_ry_matrix(angle), qubit)
 
     def apply_rz(self, qubit: int, angle: float) -> None:
         """Apply a rotation around the Z axis by ``angle`` radians."""
 
-        half = angle / 2.0
-        phase_neg = math.cos(half) - 1j * math.sin(half)
-        phase_pos = math.cos(half) + 1j * math.sin(half)
-        gate: GateMatrix = (
-            (phase_neg, 0 + 0j),
-            (0 + 0j, phase_pos),
-        )
-        self._apply_single_qubit_gate(gate, qubit)
+        self._apply_gate(_rz_matrix(angle), qubit)
+
+    def apply_diag_chain(self, phases_per_qubit: Mapping[int, Tuple[complex, complex]]) -> None:
+        """Apply several single-qubit diagonal gates in one pass over the state.
+
+        ``phases_per_qubit`` maps a qubit index to the ``(phase0, phase1)``
+        entries of its diagonal gate, e.g. ``{0: (1, 1j), 2: (1, -1)}`` applies
+        S to qubit 0 and Z to qubit 2.  The per-qubit diagonals are combined
+        into a single diagonal with outer products, which is then multiplied
+        into the state vector elementwise.
+        """
+
+        self._check_qubits(*phases_per_qubit)
+        if any(len(phases) != 2 for phases in phases_per_qubit.values()):
+            raise ValueError("Each diagonal must be given as a (phase0, phase1) pair")
+        if not phases_per_qubit:
+            return
+
+        # Qubits after the last one touched only contribute identity factors, so
+        # the diagonal is built over the leading qubits and broadcast over the rest.
+        last = max(phases_per_qubit)
+        diagonal = np.ones(1, dtype=np.complex128)
+        for q in range(last + 1):
+            factor = np.asarray(phases_per_qubit.get(q, (1, 1)), dtype=np.complex128)
+            diagonal = np.multiply.outer(diagonal, factor).reshape(-1)
+        diagonal = self._xp.asarray(diagonal, dtype=self.dtype)
+        self.state.reshape(diagonal.size, -1)[...] *= diagonal[:, np.newaxis]
 
     def apply_cnot(self, control: int, target: int) -> None:
         """Apply a controlled-NOT (CNOT) gate.
@@ -166,35 +634,91 @@ class QuantumCircuit:
 
         if control == target:
             raise ValueError("Control and target must be different for CNOT")
-        if any(q < 0 or q >= self.num_qubits for q in (control, target)):
-            raise IndexError("Qubit index out of range")
-
-        control_mask = 1 << (self.num_qubits - 1 - control)
-        target_mask = 1 << (self.num_qubits - 1 - target)
-        new_state = [0j] * len(self.state)
-        for index, amplitude in enumerate(self.state):
-            if index & control_mask:
-                new_index = index ^ target_mask
-            else:
-                new_index = index
-            new_state[new_index] += amplitude
-        self.state = new_state
+        self._check_qubits(control, target)
+        self._enqueue((control, target), CNOT_MATRIX)
 
     def apply_cz(self, control: int, target: int) -> None:
         """Apply a controlled-Z (CZ) gate."""
 
         if control == target:
             raise ValueError("Control and target must be different for CZ")
-        if any(q < 0 or q >= self.num_qubits for q in (control, target)):
-            raise IndexError("Qubit index out of range")
+        self._check_qubits(control, target)
+        self._enqueue((control, target), CZ_MATRIX)
+
+    def apply_bell_prep(self, control: int, target: int) -> None:
+        """Apply a Hadamard to ``control`` followed by a CNOT onto ``target``.
 
-        control_mask = 1 << (self.num_qubits - 1 - control)
-        target_mask = 1 << (self.num_qubits - 1 - target)
-        new_state = self.state.copy()
-        for index, amplitude in enumerate(self.state):
-            if (index & control_mask) and (index & target_mask):
-                new_state[index] = -amplitude
-        self.state = new_state
+        This is the usual Bell-pair preparation; it is queued as a single
+        two-qubit gate so that both steps are applied in one pass over the
+        state vector.
+        """
+
+        if control == target:
+            raise ValueError("Control and target must be different for a Bell pair")
+        self._check_qubits(control, target)
+        self._enqueue((control, target), BELL_PREP_MATRIX)
+
+    def _apply_bell_prep_kernel(self, control: int, target: int) -> None:
+        if self._use_numba:
+            n = self.num_qubits
+            self._numba.apply_bell_prep(self._state, n - 1 - control, n - 1 - target, _INV_SQRT2)
+            return
+        # The 1/sqrt(2) factor is folded into the scratch copies and the
+        # in-place scaling of the other two slabs, so every slab is written
+        # by the sums and differences without a separate normalising pass.
+        xp = self._xp
+        s00 = self._two_qubit_slab(control, target, 0, 0)
+        s01 = self._two_qubit_slab(control, target, 0, 1)
+        s10 = self._two_qubit_slab(control, target, 1, 0)
+        s11 = self._two_qubit_slab(control, target, 1, 1)
+        a = s00 * _INV_SQRT2
+        c = s10 * _INV_SQRT2
+        s01 *= _INV_SQRT2
+        s11 *= _INV_SQRT2
+        xp.add(a, c, out=s00)
+        xp.subtract(s01, s11, out=s10)
+        xp.add(s01, s11, out=s01)
+        xp.subtract(a, c, out=s11)
+
+    def _apply_cnot_kernel(self, control: int, target: int) -> None:
+        if self._use_numba:
+            n = self.num_qubits
+            self._numba.apply_cnot(self._state, n - 1 - control, n - 1 - target)
+            return
+        one_zero = self._two_qubit_slab(control, target, 1, 0)
+        one_one = self._two_qubit_slab(control, target, 1, 1)
+        scratch = one_zero.copy()
+        one_zero[...] = one_one
+        one_one[...] = scratch
+
+    def _apply_cz_kernel(self, control: int, target: int) -> None:
+        if self._use_numba:
+            n = self.num_qubits
+            self._numba.apply_cz(self._state, n - 1 - control, n - 1 - target)
+            return
+        self._two_qubit_slab(control, target, 1, 1)[...] *= -1
+
+    def _two_qubit_slab(
+        self, control: int, target: int, control_bit: int, target_bit: int
+    ) -> np.ndarray:
+        """Return a writable view of the amplitudes with fixed ``control``/``target`` bits.
+
+        The state vector is reshaped to a rank-5 tensor whose axes 1 and 3 are
+        the two qubits (in order of significance); indexing those axes selects
+        the quarter of the amplitudes matching ``control_bit`` and
+        ``target_bit`` without copying.
+        """
+
+        low, high = sorted((control, target))
+        blocks = self._state.reshape(
+            1 << low,
+            2,
+            1 << (high - low - 1),
+            2,
+            1 << (self.num_qubits - 1 - high),
+        )
+        bits = {control: control_bit, target: target_bit}
+        return blocks[:, bits[low], :, bits[high], :]
 
     def measure(self, qubit: int) -> int:
         """Measure a single qubit and collapse the state.
@@ -204,27 +728,28 @@ class QuantumCircuit:
         observed result.
         """
 
-        outcome, new_state = self._collapse_qubits([qubit])
-        self.state = new_state
+        outcome = self._collapse_qubits([qubit])
         self.measurements = [int(outcome)] if outcome else []
         return int(outcome) if outcome else 0
 
     def measure_all(self) -> str:
-        """Measure all qubits sequentially, returning a bitstring.
+        """Measure all qubits, returning a bitstring.
 
-        The measurement outcomes are stored in the instance attribute
+        A single basis state is sampled from the joint distribution
+        ``|amplitude|**2``, which is equivalent to measuring the qubits one
+        after another but needs only one pass over the state vector.  The
+        measurement outcomes are stored in the instance attribute
         ``measurements`` and returned as a concatenated string (qubit 0 first).
         """
 
-        bits: List[int] = []
-        self.measurements = []
-        for q in range(self.num_qubits):
-            outcome, new_state = self._collapse_qubits([q])
-            bit = int(outcome) if outcome else 0
-            bits.append(bit)
-            self.measurements.append(bit)
-            self.state = new_state
-        return "".join(str(b) for b in bits)
+        state = self.state
+        index = self._sample_outcome(self._squared_magnitudes(state))
+        amplitude = state[index]
+        state[:] = 0
+        state[index] = amplitude / abs(amplitude)
+        bitstring = format(index, f"0{self.num_qubits}b")
+        self.measurements = [int(bit) for bit in bitstring]
+        return bitstring
 
     def measure_subset(self, qubits: Sequence[int]) -> str:
         """Measure only the specified ``qubits`` and collapse the state.
@@ -236,76 +761,153 @@ class QuantumCircuit:
         relative amplitudes, preserving entanglement when possible.
         """
 
-        outcome, new_state = self._collapse_qubits(qubits)
-        self.state = new_state
+        outcome = self._collapse_qubits(qubits)
         self.measurements = [int(bit) for bit in outcome]
         return outcome
 
-    def statevector(self) -> List[complex]:
+    def sample(self, shots: int) -> List[str]:
+        """Sample ``shots`` measurement outcomes of all qubits without collapsing.
+
+        All uniform draws are generated in one batch and mapped to basis
+        states with a single ``searchsorted`` call.  The state vector and
+        ``measurements`` are left unchanged.
+        """
+
+        if shots < 0:
+            raise ValueError("shots must be non-negative")
+        indices = self._sample_indices(self._squared_magnitudes(self.state), shots)
+        return [format(int(index), f"0{self.num_qubits}b") for index in indices.tolist()]
+
+    def statevector(self) -> np.ndarray:
         """Return a copy of the current state vector."""
 
-        return self.state.copy()
+        return self._to_host(self.state)
+
+    def statevector_view(self) -> np.ndarray:
+        """Return a read-only view of the current state vector without copying.
+
+        The view shares memory with the circuit, so it is only meaningful
+        until the next gate or measurement is applied; call
+        ``statevector`` for an independent snapshot.  For ``device="cuda"``
+        circuits the view is a CuPy array in device memory, and it is
+        writable because CuPy arrays cannot be marked read-only; writing to
+        it changes the circuit's state.
+        """
+
+        view = self.state.view()
+        if self._xp is np:
+            view.setflags(write=False)
+        return view
 
-    def probabilities(self) -> List[float]:
+    def probabilities(self) -> np.ndarray:
         """Return measurement probabilities for each basis state."""
 
-        return [abs(amp) ** 2 for amp in self.state]
+        probabilities = self._squared_magnitudes(self.state)
+        # The einsum result is already a fresh array; only device arrays are copied.
+        if self._xp is np:
+            return probabilities
+        return self._xp.asnumpy(probabilities)
 
-    def amplitudes(self) -> Sequence[complex]:
-        """Return a tuple view of the current amplitudes."""
+    def amplitudes(self) -> np.ndarray:
+        """Return a copy of the current amplitudes."""
 
-        return tuple(self.state)
+        return self._to_host(self.state)
 
     def initialize_statevector(self, amplitudes: Sequence[complex]) -> None:
         """Initialise the circuit with a custom ``amplitudes`` state vector."""
 
-        expected = 2 ** self.num_qubits
-        if len(amplitudes) != expected:
+        expected = 1 << self.num_qubits
+        # A private copy in the circuit's dtype, which is then stored directly.
+        state = np.array(amplitudes, dtype=self.dtype)
+        if state.shape != (expected,):
             raise ValueError(
-                f"State vector must have length {expected}, got {len(amplitudes)}"
+                f"State vector must have length {expected}, got shape {state.shape}"
             )
-        norm = sum(abs(amp) ** 2 for amp in amplitudes)
-        if not math.isclose(norm, 1.0, rel_tol=1e-9, abs_tol=1e-9):
+        norm = np.vdot(state, state).real
+        tolerance = 1e-5 if self.dtype == np.complex64 else 1e-9
+        if not math.isclose(norm, 1.0, rel_tol=tolerance, abs_tol=tolerance):
             raise ValueError("State vector must be normalised to 1.0")
-        self.state = [complex(amp) for amp in amplitudes]
+        self.state = state
 
-    def _collapse_qubits(self, qubits: Sequence[int]) -> Tuple[str, List[complex]]:
-        """Return outcome and collapsed state for measuring ``qubits``."""
+    def _collapse_qubits(self, qubits: Sequence[int]) -> str:
+        """Measure ``qubits``, collapse the state and return the outcome bitstring.
 
-        if any(q < 0 or q >= self.num_qubits for q in qubits):
-            raise IndexError("Qubit index out of range")
+        Only the pending gates in the lightcone of ``qubits`` are applied
+        before sampling; the others stay queued and are applied after the
+        collapse when the state is next observed.
+        """
+
+        self._check_qubits(*qubits)
         if len(set(qubits)) != len(qubits):
             raise ValueError("Qubit indices must be unique for measurement")
         if not qubits:
-            return "", self.state.copy()
-
-        outcome_probs: dict[Tuple[int, ...], float] = {}
-        for index, amplitude in enumerate(self.state):
-            bits = tuple((index >> (self.num_qubits - 1 - q)) & 1 for q in qubits)
-            outcome_probs[bits] = outcome_probs.get(bits, 0.0) + abs(amplitude) ** 2
-
-        rand = random.random()
-        cumulative = 0.0
-        chosen_outcome: Tuple[int, ...] | None = None
-        sorted_outcomes = sorted(outcome_probs.items(), key=lambda item: item[0], reverse=True)
-        for bits, prob in sorted_outcomes:
-            cumulative += prob
-            if rand < cumulative:
-                chosen_outcome = bits
-                break
-        if chosen_outcome is None:
-            # Fallback in case of floating-point accumulation error.
-            chosen_outcome = sorted_outcomes[-1][0]
-
-        new_state = [0j] * len(self.state)
-        for index, amplitude in enumerate(self.state):
-            bits = tuple((index >> (self.num_qubits - 1 - q)) & 1 for q in qubits)
-            if bits == chosen_outcome:
-                new_state[index] = amplitude
-
-        prob = outcome_probs[chosen_outcome]
-        if prob > 0:
-            norm = math.sqrt(prob)
-            new_state = [amp / norm for amp in new_state]
-
-        return "".join(str(bit) for bit in chosen_outcome), new_state
+            return ""
+
+        deferred = self._split_lightcone(qubits)
+        n = self.num_qubits
+        state = self.state
+        probs = self._squared_magnitudes(state)
+        # Marginalise over the unmeasured qubits, then order the remaining axes
+        # as requested so that ``marginals[i]`` is the probability of the
+        # outcome whose bits (first qubit most significant) spell ``i``.
+        measured = sorted(qubits)
+        unmeasured = tuple(sorted(set(range(n)) - set(qubits)))
+        marginals = probs.reshape((2,) * n).sum(axis=unmeasured)
+        marginals = marginals.transpose([measured.index(q) for q in qubits]).ravel()
+
+        choice = self._sample_outcome(marginals)
+        outcome = format(choice, f"0{len(qubits)}b")
+        chosen_outcome = [int(bit) for bit in outcome]
+
+        prob = float(marginals[choice])
+        scale = 1.0 / math.sqrt(prob) if prob > 0 else 1.0
+        # The state is collapsed in place, without building a new state vector.
+        if self._use_numba:
+            measured_mask = 0
+            pattern = 0
+            for q, bit in zip(qubits, chosen_outcome):
+                measured_mask |= self._mask_for_q[q]
+                if bit:
+                    pattern |= self._mask_for_q[q]
+            self._numba.collapse(state, state, measured_mask, pattern, scale)
+        else:
+            # Indexing each measured axis with its observed bit selects the
+            # surviving amplitudes as one slab; everything else is zeroed.
+            selector: List[object] = [slice(None)] * n
+            for q, bit in zip(qubits, chosen_outcome):
+                selector[q] = bit
+            view = state.reshape((2,) * n)
+            kept = view[tuple(selector)] * scale
+            state[...] = 0
+            view[tuple(selector)] = kept
+
+        self._pending = deferred
+        return outcome
+
+    def _sample_outcome(self, distribution: np.ndarray) -> int:
+        """Draw an index from the discrete probability ``distribution``."""
+
+        return int(self._sample_indices(distribution, 1)[0])
+
+    def _sample_indices(self, distribution: np.ndarray, count: int) -> np.ndarray:
+        """Draw ``count`` indices from the discrete probability ``distribution``.
+
+        Outcomes are scanned from the largest index down to the smallest, so
+        a uniform draw close to zero selects the highest outcome with
+        non-zero probability.  Draws are scaled by the total probability, so
+        rounding in the cumulative sum can never push one past the last
+        outcome.
+        """
+
+        xp = self._xp
+        cumulative = xp.cumsum(distribution[::-1])
+        draws = xp.asarray(self._uniforms(count) * float(cumulative[-1]))
+        positions = xp.searchsorted(cumulative, draws, side="right")
+        return len(distribution) - 1 - positions
+
+    def _uniforms(self, count: int) -> np.ndarray:
+        """Return ``count`` uniform draws from ``rng`` or the ``random`` module."""
+
+        if self.rng is not None:
+            return self.rng.random(count)
+        return np.array([random.random() for _ in range(count)])
@@ -1,9 +1,14 @@
 import math
+import pathlib
 import random
+import subprocess
+import sys
+import types
 
+import numpy as np
 import pytest
 
-from native_ai_quantum_energy.quantum_simulator import QuantumCircuit
+from native_ai_quantum_energy.quantum_simulator import BELL_PREP_MATRIX, QuantumCircuit
 
 
 def assert_complex_approx(value: complex, expected_real: float, expected_imag: float = 0.0) -> None:
@@ -194,3 +199,361 @@ def test_initialize_statevector_validates_input():
     amplitudes = [a / norm for a in amplitudes]
     qc.initialize_statevector(amplitudes)
     assert qc.statevector() == pytest.approx(amplitudes)
+
+
+def test_single_qubit_gate_acts_on_requested_qubit():
+    qc = QuantumCircuit(3)
+    qc.apply_pauli_x(1)
+    state = qc.statevector()
+    # Qubit 0 is the most significant bit, so |010> is basis index 2.
+    assert_complex_approx(state[2], 1.0)
+    assert sum(abs(amp) ** 2 for amp in state) == pytest.approx(1.0)
+
+
+def test_cnot_with_control_below_target():
+    qc = QuantumCircuit(3)
+    qc.apply_pauli_x(2)
+    qc.apply_cnot(2, 0)
+    state = qc.statevector()
+    # |001> becomes |101>, i.e. basis index 5.
+    assert_complex_approx(state[5], 1.0)
+    qc.apply_cz(0, 2)
+    assert_complex_approx(qc.statevector()[5], -1.0)
+
+
+def test_diag_chain_matches_individual_gates():
+    chained = QuantumCircuit(3)
+    individual = QuantumCircuit(3)
+    for qc in (chained, individual):
+        for q in range(3):
+            qc.apply_hadamard(q)
+
+    chained.apply_diag_chain({0: (1, 1j), 1: (1, -1)})
+    individual.apply_s(0)
+    individual.apply_pauli_z(1)
+    assert chained.statevector() == pytest.approx(individual.statevector())
+
+    with pytest.raises(ValueError):
+        chained.apply_diag_chain({0: (1, -1, 3)})
+
+
+def test_gate_fusion_matches_unfused_simulation():
+    fused = QuantumCircuit(3)
+    unfused = QuantumCircuit(3, max_fused_qubits=1)
+    for qc in (fused, unfused):
+        qc.apply_hadamard(0)
+        qc.apply_rz(0, 0.3)
+        qc.apply_hadamard(0)
+        qc.apply_cnot(0, 1)
+        qc.apply_ry(2, 1.1)
+        qc.apply_cz(2, 0)
+        qc.apply_t(1)
+    assert fused.statevector() == pytest.approx(unfused.statevector())
+
+
+def test_fusion_keeps_structured_kernels():
+    qc = QuantumCircuit(3)
+    qc.apply_cnot(0, 1)
+    qc.apply_ry(1, 0.3)
+    qc.apply_cz(1, 2)
+    qc.apply_rz(2, 0.7)
+    # RY would turn the CNOT into a dense block, while RZ keeps CZ diagonal.
+    assert [qubits for qubits, _ in qc._pending] == [(0, 1), (1,), (1, 2)]
+
+    bell = QuantumCircuit(3)
+    bell.apply_hadamard(2)
+    bell.apply_cnot(2, 0)
+    assert [qubits for qubits, _ in bell._pending] == [(2, 0)]
+    assert np.array_equal(bell._pending[0][1], BELL_PREP_MATRIX)
+
+
+def test_invalid_max_fused_qubits():
+    with pytest.raises(ValueError):
+        QuantumCircuit(2, max_fused_qubits=0)
+
+
+def test_measure_all_samples_joint_outcome(monkeypatch):
+    qc = QuantumCircuit(2)
+    qc.apply_hadamard(0)
+    qc.apply_cnot(0, 1)
+    qc.apply_s(1)
+    monkeypatch.setattr(random, "random", lambda: 0.25)
+    outcome = qc.measure_all()
+    assert outcome == "11"
+    assert qc.measurements == [1, 1]
+    state = qc.statevector()
+    assert abs(state[3]) == pytest.approx(1.0)
+    assert qc.probabilities() == pytest.approx([0.0, 0.0, 0.0, 1.0])
+
+
+def test_numba_kernels_match_numpy_kernels(monkeypatch):
+    pytest.importorskip("numba")
+    from native_ai_quantum_energy import _kernels
+
+    def run(min_qubits):
+        monkeypatch.setattr(_kernels, "NUMBA_MIN_QUBITS", min_qubits)
+        monkeypatch.setattr(random, "random", lambda: 0.3)
+        qc = QuantumCircuit(4, max_fused_qubits=1)
+        for q in range(4):
+            qc.apply_ry(q, 0.4 + q)
+        qc.apply_cnot(3, 1)
+        qc.apply_cz(0, 2)
+        qc.apply_rx(2, 0.7)
+        qc.apply_bell_prep(1, 3)
+        outcome = qc.measure_subset([2, 0])
+        return outcome, qc.statevector()
+
+    numba_outcome, numba_state = run(1)
+    numpy_outcome, numpy_state = run(64)
+    assert numba_outcome == numpy_outcome
+    assert numba_state == pytest.approx(numpy_state)
+
+
+def test_numba_is_imported_only_for_large_circuits():
+    pytest.importorskip("numba")
+    code = (
+        "import sys\n"
+        "from native_ai_quantum_energy import QuantumCircuit\n"
+        "QuantumCircuit(4)\n"
+        "print('numba' in sys.modules)\n"
+        "QuantumCircuit(14)\n"
+        "print('numba' in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        cwd=pathlib.Path(__file__).resolve().parents[1],
+        text=True,
+    )
+    assert result.stdout.split() == ["False", "True"]
+
+
+def test_unknown_device_is_rejected():
+    with pytest.raises(ValueError):
+        QuantumCircuit(1, device="tpu")
+
+
+def test_cuda_device_runs_through_array_module(monkeypatch):
+    # A NumPy-backed stand-in for CuPy drives the device-side code paths.
+    cupy = types.ModuleType("cupy")
+    cupy.__dict__.update({name: getattr(np, name) for name in dir(np) if not name.startswith("_")})
+    cupy.asnumpy = lambda array: np.array(array, copy=True)
+    monkeypatch.setitem(sys.modules, "cupy", cupy)
+
+    def run(device):
+        monkeypatch.setattr(random, "random", lambda: 0.3)
+        qc = QuantumCircuit(4, device=device)
+        qc.apply_hadamard(0)
+        qc.apply_cnot(0, 3)
+        qc.apply_ry(1, 1.2)
+        qc.apply_cz(1, 2)
+        qc.apply_rz(2, 0.3)
+        qc.apply_diag_chain({1: (1, 1j)})
+        samples = qc.sample(4)
+        outcome = qc.measure_subset([3, 1])
+        return qc, samples, outcome
+
+    host, host_samples, host_outcome = run("cpu")
+    device, device_samples, device_outcome = run("cuda")
+    assert device._xp is cupy
+    assert device_samples == host_samples
+    assert device_outcome == host_outcome
+    assert type(device.statevector()) is np.ndarray
+    assert device.statevector() == pytest.approx(host.statevector())
+    assert device.probabilities() == pytest.approx(host.probabilities())
+    assert device.measure_all() == host.measure_all()
+
+
+def test_single_precision_circuit():
+    qc = QuantumCircuit(2, dtype=np.complex64)
+    qc.apply_hadamard(0)
+    qc.apply_cnot(0, 1)
+    qc.apply_t(1)
+    state = qc.statevector()
+    assert state.dtype == np.complex64
+    assert qc.probabilities() == pytest.approx([0.5, 0.0, 0.0, 0.5], abs=1e-6)
+
+    qc.initialize_statevector([0.5, 0.5, 0.5, 0.5000001])
+    with pytest.raises(ValueError):
+        QuantumCircuit(1, dtype=np.float64)
+
+
+def test_measurement_defers_gates_outside_lightcone(monkeypatch):
+    qc = QuantumCircuit(3, max_fused_qubits=1)
+    qc.apply_hadamard(0)
+    qc.apply_ry(2, math.pi / 3)
+    qc.apply_pauli_x(1)
+    monkeypatch.setattr(random, "random", lambda: 0.25)
+    assert qc.measure_subset([0]) == "1"
+    # Only the Hadamard was applied before the collapse.
+    assert [qubits for qubits, _ in qc._pending] == [(2,), (1,)]
+    # Gates on qubits 1 and 2 still act on the collapsed state.
+    probs = qc.probabilities()
+    assert probs[0b110] == pytest.approx(math.cos(math.pi / 6) ** 2)
+    assert probs[0b111] == pytest.approx(math.sin(math.pi / 6) ** 2)
+
+
+def test_adjacent_inverse_gates_cancel():
+    qc = QuantumCircuit(2, max_fused_qubits=1)
+    qc.apply_hadamard(0)
+    qc.apply_cnot(0, 1)
+    qc.apply_cnot(0, 1)
+    qc.apply_hadamard(0)
+    assert qc._cancel_inverse_pairs(qc._pending) == []
+    assert qc.probabilities() == pytest.approx([1.0, 0.0, 0.0, 0.0])
+
+
+def test_assigned_state_is_stored_contiguously():
+    qc = QuantumCircuit(2)
+    backing = np.zeros(8, dtype=np.complex128)
+    backing[0] = 1.0
+    qc.state = backing[::2]
+    qc.apply_pauli_x(1)
+    assert qc.probabilities() == pytest.approx([0.0, 1.0, 0.0, 0.0])
+
+
+def test_fused_diagonal_block_matches_expected_phases():
+    qc = QuantumCircuit(3)
+    for q in range(3):
+        qc.apply_hadamard(q)
+    initial = qc.statevector()
+    qc.apply_cz(0, 2)
+    qc.apply_t(2)
+    qc.apply_rz(0, 0.3)
+    expected = []
+    for index, amplitude in enumerate(initial):
+        b0, b2 = index >> 2 & 1, index & 1
+        phase = (-1) ** (b0 & b2) * complex(math.cos(math.pi / 4), math.sin(math.pi / 4)) ** b2
+        phase *= complex(math.cos(0.15), (1 if b0 else -1) * math.sin(0.15))
+        expected.append(amplitude * phase)
+    assert qc.statevector() == pytest.approx(expected)
+
+
+def test_unrolled_kernel_matches_numpy_kernels():
+    unrolled = QuantumCircuit(3)
+    vectorised = QuantumCircuit(3)
+    vectorised._use_unrolled = False
+    for qc in (unrolled, vectorised):
+        for q in range(3):
+            qc.apply_ry(q, 0.3 + q)
+            qc.statevector()
+            qc.apply_pauli_y(2 - q)
+            qc.statevector()
+            qc.apply_t(q)
+    assert unrolled.statevector() == pytest.approx(vectorised.statevector())
+
+
+def test_single_qubit_fast_paths_on_larger_register():
+    # Four qubits is above the unrolled-kernel size, so the butterfly (H),
+    # anti-diagonal (X, Y) and diagonal (Z, S, RZ) NumPy kernels are used.
+    qc = QuantumCircuit(4, max_fused_qubits=1)
+    qc.apply_hadamard(0)
+    qc.apply_pauli_x(1)
+    qc.apply_pauli_y(2)
+    qc.apply_hadamard(3)
+    qc.statevector()
+    qc.apply_s(0)
+    qc.apply_rz(1, 0.8)
+    qc.apply_pauli_z(3)
+    expected = np.kron(
+        np.kron([1 / math.sqrt(2), 1j / math.sqrt(2)], [0, complex(math.cos(0.4), math.sin(0.4))]),
+        np.kron([0, 1j], [1 / math.sqrt(2), -1 / math.sqrt(2)]),
+    )
+    assert qc.statevector() == pytest.approx(expected)
+
+
+def test_initialize_statevector_copies_input_array():
+    amplitudes = np.array([0.0, 1.0], dtype=np.complex128)
+    qc = QuantumCircuit(1)
+    qc.initialize_statevector(amplitudes)
+    amplitudes[:] = [1.0, 0.0]
+    assert qc.probabilities() == pytest.approx([0.0, 1.0])
+
+
+def test_bell_prep_matches_hadamard_then_cnot(monkeypatch):
+    for control, target in ((0, 2), (2, 1)):
+        fused = QuantumCircuit(3)
+        separate = QuantumCircuit(3, max_fused_qubits=1)
+        for qc in (fused, separate):
+            qc.apply_ry(0, 0.4)
+            qc.apply_rx(1, 1.3)
+            qc.apply_ry(2, 2.1)
+            qc.statevector()
+        fused.apply_bell_prep(control, target)
+        separate.apply_hadamard(control)
+        separate.apply_cnot(control, target)
+        assert fused.statevector() == pytest.approx(separate.statevector())
+
+    # In single precision the block must still be recognised as a Bell
+    # preparation, although its 1/sqrt(2) entries round when cast.
+    single = QuantumCircuit(5, dtype=np.complex64)
+    calls = []
+    kernel = single._apply_bell_prep_kernel
+
+    def recording_kernel(*qubits):
+        calls.append(qubits)
+        kernel(*qubits)
+
+    monkeypatch.setattr(single, "_apply_bell_prep_kernel", recording_kernel)
+    single.apply_bell_prep(0, 2)
+    state = single.statevector()
+    assert calls == [(0, 2)]
+    assert abs(state[0]) ** 2 == pytest.approx(0.5)
+    assert abs(state[0b10100]) ** 2 == pytest.approx(0.5)
+
+    with pytest.raises(ValueError):
+        QuantumCircuit(2).apply_bell_prep(1, 1)
+
+
+def test_statevector_view_is_read_only_and_uncopied():
+    qc = QuantumCircuit(1)
+    qc.apply_hadamard(0)
+    view = qc.statevector_view()
+    assert_complex_approx(view[0], 1 / math.sqrt(2))
+    assert_complex_approx(view[1], 1 / math.sqrt(2))
+    assert np.shares_memory(view, qc.state)
+    with pytest.raises(ValueError):
+        view[0] = 0
+
+
+def test_single_qubit_gates_accumulate_across_other_qubits():
+    qc = QuantumCircuit(2, max_fused_qubits=1)
+    qc.apply_pauli_x(0)
+    qc.apply_hadamard(1)
+    qc.apply_s(0)
+    qc.apply_t(0)
+    state = qc.statevector()
+    phase = complex(math.cos(3 * math.pi / 4), math.sin(3 * math.pi / 4))
+    assert state == pytest.approx([0, 0, phase / math.sqrt(2), phase / math.sqrt(2)])
+
+
+def test_gates_on_disjoint_qubits_are_not_fused():
+    qc = QuantumCircuit(3)
+    qc.apply_hadamard(0)
+    qc.apply_pauli_x(1)
+    qc.apply_s(0)
+    assert [qubits for qubits, _ in qc._pending] == [(0,), (1,)]
+
+
+def test_generator_drives_measurements_and_sampling():
+    def run(seed):
+        qc = QuantumCircuit(3, rng=np.random.default_rng(seed))
+        for q in range(3):
+            qc.apply_hadamard(q)
+        shots = qc.sample(50)
+        return shots, qc.measure_subset([2, 0])
+
+    assert run(7) == run(7)
+    shots, _ = run(7)
+    assert len(shots) == 50
+    assert all(len(bits) == 3 and set(bits) <= {"0", "1"} for bits in shots)
+
+
+def test_sample_does_not_collapse_state(monkeypatch):
+    qc = QuantumCircuit(2)
+    qc.apply_hadamard(0)
+    qc.apply_cnot(0, 1)
+    monkeypatch.setattr(random, "random", lambda: 0.25)
+    assert qc.sample(3) == ["11", "11", "11"]
+    assert qc.probabilities() == pytest.approx([0.5, 0.0, 0.0, 0.5])